@@ -1,24 +1,108 @@
 """Memory usage analysis"""
 
-from collections import defaultdict
-from typing import Any, Dict, List, Tuple
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from .stats import calculate_stats
+from ._kernels import group_median, group_stats
+
+
+def _stats_records(
+    codes: np.ndarray, values: np.ndarray, ngroups: int, sizes: Optional[np.ndarray] = None
+) -> List[Dict[str, float]]:
+    """
+    Calculate per-cluster stats dicts for one column.
+
+    Args:
+        codes: Cluster code for each value
+        values: Column values; NaN entries are ignored by the statistics
+        ngroups: Number of clusters
+        sizes: Optional number of jobs per cluster. When given, count reports
+            it (missing values included, as calculate_stats does for a cluster's
+            job values); otherwise count is the number of valid values.
+
+    Returns:
+        List of dicts with keys: mean, median, stdev, min, max, count. Clusters
+        with no values get all-zero stats, matching calculate_stats.
+    """
+    count, mean, stdev, minimum, maximum = group_stats(codes, values, ngroups)
+    medians = group_median(codes, values, ngroups)
+    if sizes is None:
+        sizes = count
+
+    records = []
+    for n, n_valid, mean_val, median, stdev_val, min_val, max_val in zip(
+        sizes.tolist(),
+        count.tolist(),
+        mean.tolist(),
+        medians.tolist(),
+        stdev.tolist(),
+        minimum.tolist(),
+        maximum.tolist(),
+    ):
+        if n == 0:
+            records.append({"mean": 0, "median": 0, "stdev": 0, "min": 0, "max": 0, "count": 0})
+        elif n_valid == 0:
+            records.append(
+                {
+                    "mean": np.nan,
+                    "median": np.nan,
+                    "stdev": np.nan,
+                    "min": np.nan,
+                    "max": np.nan,
+                    "count": n,
+                }
+            )
+        else:
+            records.append(
+                {
+                    "mean": mean_val,
+                    "median": median,
+                    "stdev": stdev_val,
+                    "min": min_val,
+                    "max": max_val,
+                    "count": n,
+                }
+            )
+    return records
+
+
+def _fingerprint(df: pd.DataFrame) -> str:
+    """
+    Hash the contents of a DataFrame (ignoring its index).
+
+    Args:
+        df: DataFrame to hash
+
+    Returns:
+        Hex digest identifying the frame's values
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.sha1(row_hashes.tobytes()).hexdigest()
 
 
 class MemoryAnalyzer:
     """Analyzer for memory usage patterns"""
 
-    def __init__(self, min_jobs: int = 20):
+    # Columns analyze() needs in its input DataFrame
+    REQUIRED_COLUMNS = frozenset({"ClusterId", "Owner", "RequestMemory", "MemoryUsage"})
+
+    def __init__(self, min_jobs: int = 20, cache_size: int = 0):
         """
         Initialize Memory Analyzer.
 
         Args:
             min_jobs: Minimum number of jobs in a cluster to analyze
+            cache_size: Number of recent analyze() results to keep for reuse when
+                called again with identical data and min_jobs (default: 0, no
+                caching). Enabling it costs a hash of the input on every call.
         """
         self.min_jobs = min_jobs
+        self.cache_size = cache_size
+        self._cache: OrderedDict[Tuple[str, int], Dict[str, Any]] = OrderedDict()
 
     def analyze(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -29,27 +113,50 @@ class MemoryAnalyzer:
                 RequestMemory, MemoryUsage
 
         Returns:
-            Dict with keys: cluster_analyses, user_totals, over_allocators
+            Dict with keys: cluster_analyses, user_totals, over_allocators,
+            all_used_memory (float32 array of MemoryUsage for all analyzed jobs).
+            Repeated calls with the same data may return the same cached dict,
+            so treat it as read-only.
 
         Raises:
             ValueError: If required columns are missing
         """
         # Validate required columns
-        required = {"ClusterId", "Owner", "RequestMemory", "MemoryUsage"}
-        if not required.issubset(df.columns):
-            missing = required - set(df.columns)
+        columns = set(df.columns)
+        if not self.REQUIRED_COLUMNS.issubset(columns):
+            missing = self.REQUIRED_COLUMNS - columns
             raise ValueError(
-                f"DataFrame missing required columns for memory analysis: {missing}. "
-                f"Available columns: {set(df.columns)}"
+                f"DataFrame missing required columns for memory analysis: {set(missing)}. "
+                f"Available columns: {columns}"
             )
 
+        # Reuse a previous result for identical job data and threshold
+        cache_key = None
+        if self.cache_size > 0:
+            cache_key = (_fingerprint(df[sorted(self.REQUIRED_COLUMNS)]), self.min_jobs)
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                return self._cache[cache_key]
+
+        # Memory values only need MB precision; float32 halves the bytes every
+        # reduction below has to walk, and cluster IDs fit a narrow integer
+        df = df.assign(
+            ClusterId=pd.to_numeric(df["ClusterId"], downcast="integer"),
+            RequestMemory=pd.to_numeric(df["RequestMemory"], errors="coerce").astype(np.float32),
+            MemoryUsage=pd.to_numeric(df["MemoryUsage"], errors="coerce").astype(np.float32),
+        )
+
         # Filter clusters by min_jobs threshold
-        cluster_counts = df.groupby("ClusterId").size()
-        large_clusters = cluster_counts[cluster_counts >= self.min_jobs].index
-        filtered_df = df[df["ClusterId"].isin(large_clusters)]
+        cluster_sizes = df.groupby("ClusterId")["ClusterId"].transform("size")
+        filtered_df = df.loc[cluster_sizes >= self.min_jobs]
+
+        # Keep each cluster's jobs contiguous so per-cluster usage can be a
+        # view into one shared array instead of a separate list per cluster
+        filtered_df = filtered_df.sort_values("ClusterId", kind="stable")
+        all_used_memory = filtered_df["MemoryUsage"].to_numpy(dtype=np.float32)
 
         # Analyze by cluster
-        cluster_analyses = self._analyze_by_cluster(filtered_df)
+        cluster_analyses = self._analyze_by_cluster(filtered_df, all_used_memory)
 
         # Analyze by user
         user_totals = self._analyze_by_user(cluster_analyses)
@@ -57,53 +164,80 @@ class MemoryAnalyzer:
         # Find over-allocators
         over_allocators = self._find_over_allocators(cluster_analyses)
 
-        return {
+        results = {
             "cluster_analyses": cluster_analyses,
             "user_totals": user_totals,
             "over_allocators": over_allocators,
+            "all_used_memory": all_used_memory,
         }
 
-    def _analyze_by_cluster(self, df: pd.DataFrame) -> List[Dict]:
+        if cache_key is not None:
+            self._cache[cache_key] = results
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return results
+
+    def _analyze_by_cluster(self, df: pd.DataFrame, used_memory: np.ndarray) -> List[Dict]:
         """
         Group by ClusterId and calculate memory stats.
 
         Args:
-            df: DataFrame with job data
+            df: DataFrame with job data, sorted by ClusterId
+            used_memory: MemoryUsage values in the same row order as df; each
+                cluster's raw_data holds a slice of this array
 
         Returns:
-            List of cluster analysis dicts
+            List of cluster analysis dicts, ordered by cluster_id
         """
         analyses = []
 
-        for cluster_id, group in df.groupby("ClusterId"):
-            # Get owner (assume all jobs in cluster have same owner)
-            owner = group["Owner"].iloc[0] if len(group) > 0 else "unknown"
-
-            # Extract memory data
-            requested_memory = group["RequestMemory"].tolist()
-            used_memory = group["MemoryUsage"].tolist()
-
-            # Calculate usage ratios
-            memory_ratios = []
-            for req, used in zip(requested_memory, used_memory):
-                if req and req > 0 and used is not None:
-                    memory_ratios.append(used / req)
+        # Usage ratio per job; NaN where nothing was requested or usage is missing
+        requested = df["RequestMemory"].to_numpy()
+        used = df["MemoryUsage"].to_numpy()
+        ratio = np.divide(
+            used,
+            requested,
+            out=np.full_like(used, np.nan),
+            where=(requested > 0) & np.isfinite(used),
+        )
 
+        # df is sorted by ClusterId, so each cluster's jobs occupy one
+        # contiguous [start, end) range of these arrays
+        codes, cluster_ids = pd.factorize(df["ClusterId"], sort=True)
+        ngroups = len(cluster_ids)
+        job_counts = np.bincount(codes, minlength=ngroups)
+        ends = np.cumsum(job_counts)
+        starts = ends - job_counts
+
+        # Get owner from each cluster's first job (assume all jobs in cluster have
+        # same owner), taking only those rows; a missing owner is None
+        owners = df["Owner"].iloc[starts].astype(object)
+        owners = owners.where(owners.notna(), None).tolist()
+
+        for cluster_id, job_count, owner, start, end, req_stats, use_stats, ratio_stats in zip(
+            cluster_ids.tolist(),
+            job_counts.tolist(),
+            owners,
+            starts.tolist(),
+            ends.tolist(),
+            _stats_records(codes, requested, ngroups, job_counts),
+            _stats_records(codes, used, ngroups, job_counts),
+            _stats_records(codes, ratio, ngroups),
+        ):
             analysis = {
                 "cluster_id": int(cluster_id),
-                "job_count": len(group),
+                "job_count": int(job_count),
                 "owner": owner,
                 "memory": {
-                    "requested": calculate_stats(requested_memory),
-                    "used": calculate_stats(used_memory),
-                    "ratios": calculate_stats(memory_ratios),
+                    "requested": req_stats,
+                    "used": use_stats,
+                    "ratios": ratio_stats,
                 },
-                "raw_data": {"used_memory": used_memory},
+                "raw_data": {"used_memory": used_memory[start:end]},
             }
             analyses.append(analysis)
 
-        # Sort by cluster_id
-        analyses.sort(key=lambda x: x["cluster_id"])
         return analyses
 
     def _analyze_by_user(self, cluster_analyses: List[Dict]) -> Dict:
@@ -116,39 +250,67 @@ class MemoryAnalyzer:
         Returns:
             Dict mapping owner to their totals
         """
-        user_totals = defaultdict(
-            lambda: {
-                "clusters": [],
-                "total_jobs": 0,
-                "total_requested_memory": 0,
-                "total_used_memory": 0,
-                "memory_ratios": [],
+        if not cluster_analyses:
+            return {}
+
+        # One row per cluster, built column by column into preallocated arrays;
+        # totals are recovered as mean * count
+        n = len(cluster_analyses)
+        memory = [analysis["memory"] for analysis in cluster_analyses]
+        clusters = pd.DataFrame(
+            {
+                "owner": [analysis["owner"] for analysis in cluster_analyses],
+                "cluster_id": np.fromiter(
+                    (analysis["cluster_id"] for analysis in cluster_analyses), np.int64, count=n
+                ),
+                "job_count": np.fromiter(
+                    (analysis["job_count"] for analysis in cluster_analyses), np.int64, count=n
+                ),
+                "requested": np.fromiter(
+                    (m["requested"]["mean"] * m["requested"]["count"] for m in memory),
+                    np.float64,
+                    count=n,
+                ),
+                "used": np.fromiter(
+                    (m["used"]["mean"] * m["used"]["count"] for m in memory), np.float64, count=n
+                ),
+                "ratio": np.fromiter(
+                    (m["ratios"]["mean"] if m["ratios"]["count"] > 0 else np.nan for m in memory),
+                    np.float64,
+                    count=n,
+                ),
             }
         )
 
-        for analysis in cluster_analyses:
-            owner = analysis["owner"]
-            user_totals[owner]["clusters"].append(analysis["cluster_id"])
-            user_totals[owner]["total_jobs"] += analysis["job_count"]
-
-            # Sum up memory values
-            mem_req_stats = analysis["memory"]["requested"]
-            mem_use_stats = analysis["memory"]["used"]
-
-            if mem_req_stats["count"] > 0:
-                user_totals[owner]["total_requested_memory"] += (
-                    mem_req_stats["mean"] * mem_req_stats["count"]
-                )
-            if mem_use_stats["count"] > 0:
-                user_totals[owner]["total_used_memory"] += (
-                    mem_use_stats["mean"] * mem_use_stats["count"]
-                )
-
-            # Collect memory ratios for averaging
-            if analysis["memory"]["ratios"]["count"] > 0:
-                user_totals[owner]["memory_ratios"].append(analysis["memory"]["ratios"]["mean"])
-
-        return dict(user_totals)
+        # Group on the owners' integer category codes (-1 for a missing owner,
+        # which is keyed None like in the cluster analyses)
+        owners = clusters["owner"].astype("category").cat
+        categories = owners.categories.tolist()
+        user_totals = clusters.groupby(owners.codes.to_numpy(), sort=False).agg(
+            clusters=("cluster_id", list),
+            total_jobs=("job_count", "sum"),
+            total_requested_memory=("requested", "sum"),
+            total_used_memory=("used", "sum"),
+            memory_ratios=("ratio", lambda ratios: ratios.dropna().tolist()),
+        )
+        # Assemble the result by zipping the aggregated columns
+        return {
+            owner: {
+                "clusters": clusters,
+                "total_jobs": total_jobs,
+                "total_requested_memory": total_requested,
+                "total_used_memory": total_used,
+                "memory_ratios": memory_ratios,
+            }
+            for owner, clusters, total_jobs, total_requested, total_used, memory_ratios in zip(
+                [categories[code] if code >= 0 else None for code in user_totals.index],
+                user_totals["clusters"].tolist(),
+                user_totals["total_jobs"].tolist(),
+                user_totals["total_requested_memory"].tolist(),
+                user_totals["total_used_memory"].tolist(),
+                user_totals["memory_ratios"].tolist(),
+            )
+        }
 
     def _find_over_allocators(
         self, cluster_analyses: List[Dict], threshold: float = 0.5
@@ -163,14 +325,16 @@ class MemoryAnalyzer:
         Returns:
             List of tuples: (cluster_id, owner, usage_ratio), sorted by ratio
         """
-        over_alloc = []
-
-        for analysis in cluster_analyses:
-            mem_ratio = analysis["memory"]["ratios"]["mean"]
-
-            if mem_ratio > 0 and mem_ratio < threshold:
-                over_alloc.append((analysis["cluster_id"], analysis["owner"], mem_ratio))
+        ratios = np.fromiter(
+            (analysis["memory"]["ratios"]["mean"] for analysis in cluster_analyses),
+            dtype=np.float64,
+            count=len(cluster_analyses),
+        )
+        candidates = np.flatnonzero((ratios > 0) & (ratios < threshold))
 
         # Sort by ratio (lowest first = worst over-allocators)
-        over_alloc.sort(key=lambda x: x[2])
-        return over_alloc
+        order = candidates[np.argsort(ratios[candidates], kind="stable")]
+        return [
+            (cluster_analyses[i]["cluster_id"], cluster_analyses[i]["owner"], ratios[i])
+            for i in order
+        ]
@@ -2,35 +2,49 @@
 
 from typing import Dict, List, Union
 
+import numpy as np
 import pandas as pd
 
 
-def calculate_stats(values: Union[List[float], pd.Series]) -> Dict[str, float]:
+def calculate_stats(values: Union[List[float], np.ndarray, pd.Series]) -> Dict[str, float]:
     """
-    Calculate statistical measures for a list or Series of values.
+    Calculate statistical measures for a list, array or Series of values.
+
+    Missing values are ignored by the statistics but included in count.
 
     Args:
-        values: List of floats or pandas Series
+        values: List of floats, NumPy array or pandas Series
 
     Returns:
         Dict with keys: mean, median, stdev, min, max, count
     """
-    # Convert to pandas Series if list
-    if isinstance(values, list):
-        if not values:
-            return {"mean": 0, "median": 0, "stdev": 0, "min": 0, "max": 0, "count": 0}
-        series = pd.Series(values)
+    # Work on a plain float array; no Series/Index is built for lists or arrays
+    if isinstance(values, pd.Series):
+        arr = values.to_numpy(dtype=np.float64, na_value=np.nan)
     else:
-        series = values
+        arr = np.asarray(values, dtype=np.float64)
 
-    if series.empty:
+    if arr.size == 0:
         return {"mean": 0, "median": 0, "stdev": 0, "min": 0, "max": 0, "count": 0}
 
+    count = arr.size
+    arr = arr[~np.isnan(arr)]
+
+    if arr.size == 0:
+        return {
+            "mean": np.nan,
+            "median": np.nan,
+            "stdev": np.nan,
+            "min": np.nan,
+            "max": np.nan,
+            "count": count,
+        }
+
     return {
-        "mean": series.mean(),
-        "median": series.median(),
-        "stdev": series.std(),
-        "min": series.min(),
-        "max": series.max(),
-        "count": len(series),
+        "mean": arr.mean(),
+        "median": np.median(arr),
+        "stdev": arr.std(ddof=1) if arr.size > 1 else np.nan,
+        "min": arr.min(),
+        "max": arr.max(),
+        "count": count,
     }
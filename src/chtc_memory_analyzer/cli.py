@@ -13,19 +13,63 @@ Usage:
 """
 
 import click
+import pandas as pd
 
 from chtc_memory_analyzer.analysis import MemoryAnalyzer
 from chtc_memory_analyzer.data import CSVSource, HTCondorSource
+from chtc_memory_analyzer.data.base import MEMORY_ANALYSIS_COLUMNS
+from chtc_memory_analyzer.data.htcondor_source import DEFAULT_PROJECTION
 from chtc_memory_analyzer.visualization import format_cluster_report, format_summary_report
 
+# Rows formatted per write when caching to CSV, bounding the text buffer size
+CSV_WRITE_CHUNKSIZE = 50000
+
+PARQUET_INSTALL_HINT = "Parquet files require pyarrow. Install with: uv pip install -e '.[parquet]'"
+
+
+def _parquet_compatible(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store object columns that mix value types as text, so Parquet can hold them.
+
+    Attributes whose expressions failed to evaluate are kept as strings next to
+    plain values (e.g. "undefined" among integers), which pyarrow cannot write
+    as one typed column.
+
+    Args:
+        df: DataFrame to be written
+
+    Returns:
+        df itself, or a copy with mixed columns converted to str (missing values kept)
+    """
+    mixed = {
+        column: df[column].where(df[column].isna(), df[column].astype(str))
+        for column in df.columns
+        if df[column].dtype == object and df[column].dropna().map(type).nunique() > 1
+    }
+    return df.assign(**mixed) if mixed else df
+
 
 @click.command()
 @click.option("--schedd", default=None, help="Schedd name to query (default: local schedd)")
 @click.option("--min-jobs", default=20, help="Minimum number of jobs in a cluster to analyze")
 @click.option("--limit", default=100, help="Maximum number of clusters to analyze")
+@click.option(
+    "--top-users",
+    type=int,
+    default=None,
+    help="Number of users to list in the summary, by total jobs (default: all)",
+)
 @click.option("--constraint", default=None, help="Additional constraint for history query")
-@click.option("--csv", type=click.Path(exists=True), help="Read from CSV instead of HTCondor")
-@click.option("--cache-csv", type=click.Path(), help="Cache HTCondor results to CSV")
+@click.option(
+    "--csv",
+    type=click.Path(exists=True),
+    help="Read from CSV (or .parquet) file instead of HTCondor",
+)
+@click.option(
+    "--cache-csv",
+    type=click.Path(),
+    help="Cache HTCondor results to CSV (Parquet if FILE ends in .parquet)",
+)
 @click.option(
     "--attributes",
     help="Comma-separated list of HTCondor attributes to fetch (e.g., ClusterId,Owner)",
@@ -35,7 +79,7 @@ from chtc_memory_analyzer.visualization import format_cluster_report, format_sum
     is_flag=True,
     help="Fetch all available job attributes (exploratory mode, overrides --attributes)",
 )
-def main(schedd, min_jobs, limit, constraint, csv, cache_csv, attributes, fetch_all):
+def main(schedd, min_jobs, limit, top_users, constraint, csv, cache_csv, attributes, fetch_all):
     """
     Analyze HTCondor job history for memory usage patterns.
 
@@ -67,15 +111,21 @@ def main(schedd, min_jobs, limit, constraint, csv, cache_csv, attributes, fetch_
     if csv:
         print(f"Reading job data from CSV: {csv}")
         source = CSVSource()
-        df = source.fetch_jobs(filepath=csv)
+        # Skip parsing columns the analysis does not use
+        try:
+            df = source.fetch_jobs(filepath=csv, usecols=MEMORY_ANALYSIS_COLUMNS)
+        except ImportError:
+            print(f"Error: {PARQUET_INSTALL_HINT}")
+            return
     else:
         print("Fetching job history from HTCondor (this may take a while)...")
         source = HTCondorSource()
 
-        # Parse attributes if provided
-        attr_list = None
+        # Parse attributes if provided; otherwise project only what analysis needs
         if attributes:
             attr_list = [a.strip() for a in attributes.split(",")]
+        else:
+            attr_list = list(DEFAULT_PROJECTION)
 
         try:
             df = source.fetch_jobs(
@@ -89,24 +139,38 @@ def main(schedd, min_jobs, limit, constraint, csv, cache_csv, attributes, fetch_
             print(f"Error querying history: {e}")
             return
 
-        # Optionally cache to CSV
+        # Optionally cache to CSV (or Parquet, if the file name ends in .parquet)
         if cache_csv:
-            print(f"Caching results to CSV: {cache_csv}")
-            df.to_csv(cache_csv, index=False)
+            use_parquet = cache_csv.endswith(".parquet")
+            if use_parquet:
+                print(f"Caching results to Parquet: {cache_csv}")
+                try:
+                    _parquet_compatible(df).to_parquet(cache_csv, compression="zstd", index=False)
+                except ImportError:
+                    print(f"Error: {PARQUET_INSTALL_HINT}")
+                    return
+                except (ValueError, TypeError) as e:
+                    print(f"Error writing Parquet cache: {e}")
+                    print("Cache to a .csv file instead to keep these results.")
+                    return
+            else:
+                print(f"Caching results to CSV: {cache_csv}")
+                df.to_csv(cache_csv, index=False, chunksize=CSV_WRITE_CHUNKSIZE)
             print(f"Cached {len(df)} jobs with {len(df.columns)} attributes")
 
             if fetch_all:
                 print(f"\nAvailable columns: {list(df.columns)}")
                 print("\nExplore the data with:")
                 print("  import pandas as pd")
-                print(f"  df = pd.read_csv('{cache_csv}')")
+                reader = "read_parquet" if use_parquet else "read_csv"
+                print(f"  df = pd.{reader}('{cache_csv}')")
                 print("  print(df.columns)")
                 return
 
     # Check if we have required columns for memory analysis
-    required_columns = {"ClusterId", "Owner", "RequestMemory", "MemoryUsage"}
-    if not required_columns.issubset(df.columns):
-        missing = required_columns - set(df.columns)
+    columns = set(df.columns)
+    if not MemoryAnalyzer.REQUIRED_COLUMNS.issubset(columns):
+        missing = set(MemoryAnalyzer.REQUIRED_COLUMNS - columns)
         print("\nWarning: Cannot run memory analysis.")
         print(f"Missing required columns: {missing}")
         print(f"Available columns: {list(df.columns)}")
@@ -136,7 +200,7 @@ def main(schedd, min_jobs, limit, constraint, csv, cache_csv, attributes, fetch_
         print(format_cluster_report(analysis))
 
     # Display summary
-    print(format_summary_report(results))
+    print(format_summary_report(results, top_users=top_users))
 
 
 if __name__ == "__main__":
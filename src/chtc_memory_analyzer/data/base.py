@@ -1,9 +1,21 @@
 """Base data source interface"""
 
 from abc import ABC, abstractmethod
-from typing import Optional, Set
+from typing import Dict, Optional, Set
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_bool_dtype, is_integer_dtype
+
+try:
+    import pyarrow  # noqa: F401
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Owner names are stored in one Arrow buffer when pyarrow is installed
+STRING_DTYPE = "string[pyarrow]" if PYARROW_AVAILABLE else "string"
 
 # Common column sets for different use cases
 MEMORY_ANALYSIS_COLUMNS = {
@@ -26,6 +38,18 @@ CPU_ANALYSIS_COLUMNS = {
 
 CORE_COLUMNS = {"ClusterId", "ProcId", "Owner", "JobStatus"}
 
+# Column types for known HTCondor attributes, used to parse files in one typed pass.
+# HTCondor job IDs are 32-bit, JobStatus is a small enum (1-7), and memory values
+# are in MB, which float32 holds exactly up to 16 TB per job.
+MEMORY_ANALYSIS_DTYPES = {
+    "ClusterId": "int32",
+    "ProcId": "int32",
+    "Owner": STRING_DTYPE,
+    "RequestMemory": "float32",
+    "MemoryUsage": "float32",
+    "JobStatus": "int8",
+}
+
 
 class DataSource(ABC):
     """Abstract base class for job data sources."""
@@ -59,3 +83,54 @@ class DataSource(ABC):
             return True  # No validation needed
 
         return required_columns.issubset(df.columns)
+
+    @classmethod
+    def apply_dtypes(cls, df: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+        """
+        Cast known columns of a DataFrame to their expected types, in place.
+
+        Columns that are absent or already have the expected type are skipped,
+        so no new column is allocated for them. Columns that cannot be cast
+        keep their current type: integer types are only applied to integer
+        columns with no missing values and every value in range (so nothing
+        wraps), and text that does not parse as the target type is left as is.
+
+        Args:
+            df: DataFrame to update
+            dtypes: Dict mapping column names to dtypes, e.g. MEMORY_ANALYSIS_DTYPES
+
+        Returns:
+            The same DataFrame
+        """
+        for column, dtype in dtypes.items():
+            if column not in df.columns or df[column].dtype == dtype:
+                continue
+            if is_integer_dtype(dtype) and not _fits_integer(df[column], dtype):
+                continue
+            try:
+                df[column] = df[column].astype(dtype)
+            except (TypeError, ValueError):
+                pass
+
+        return df
+
+
+def _fits_integer(series: pd.Series, dtype: str) -> bool:
+    """
+    Check that a column can be narrowed to an integer dtype without loss.
+
+    Args:
+        series: Column to check
+        dtype: Target integer dtype
+
+    Returns:
+        True if the column holds only integers within the dtype's range
+    """
+    if not is_integer_dtype(series.dtype) or is_bool_dtype(series.dtype):
+        return False
+    if series.empty:
+        return True
+    if series.hasnans:
+        return False
+    info = np.iinfo(dtype)
+    return info.min <= series.min() and series.max() <= info.max
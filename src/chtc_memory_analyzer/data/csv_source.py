@@ -1,10 +1,11 @@
 """CSV data source"""
 
-from typing import Dict, Optional, Set
+from typing import Dict, List, Optional, Set
 
 import pandas as pd
+from pandas.api.types import is_numeric_dtype
 
-from .base import DataSource
+from .base import MEMORY_ANALYSIS_DTYPES, PYARROW_AVAILABLE, DataSource
 
 
 class CSVSource(DataSource):
@@ -15,15 +16,27 @@ class CSVSource(DataSource):
         filepath: str,
         column_mapping: Optional[Dict[str, str]] = None,
         validate_columns: Optional[Set[str]] = None,
+        chunksize: Optional[int] = None,
+        usecols: Optional[Set[str]] = None,
     ) -> pd.DataFrame:
         """
         Read job data from CSV file and return as DataFrame.
 
+        Files ending in .parquet are read as Parquet (requires pyarrow), which
+        keeps column types and skips text parsing. Known HTCondor columns are
+        narrowed to compact types after reading. CSVs are parsed with pyarrow
+        when it is installed, and the file's header (or Parquet schema) is
+        validated before any rows are read.
+
         Args:
-            filepath: Path to CSV file
+            filepath: Path to CSV or Parquet file
             column_mapping: Optional dict mapping CSV columns to desired names
                           e.g., {'cluster_id': 'ClusterId'}
             validate_columns: Optional set of columns to validate. If None, no validation.
+            chunksize: Optional number of rows to parse at a time; chunks are
+                      concatenated into a single DataFrame
+            usecols: Optional set of columns (after mapping) to keep. Other CSV
+                    columns are skipped while parsing. If None, all columns are read.
 
         Returns:
             DataFrame with job data
@@ -41,20 +54,148 @@ class CSVSource(DataSource):
             # Read and validate specific columns are present
             from chtc_memory_analyzer.data.base import MEMORY_ANALYSIS_COLUMNS
             df = source.fetch_jobs("jobs.csv", validate_columns=MEMORY_ANALYSIS_COLUMNS)
+
+            # Read only the columns needed for memory analysis
+            df = source.fetch_jobs("jobs.csv", usecols=MEMORY_ANALYSIS_COLUMNS)
         """
-        # Read CSV
-        df = pd.read_csv(filepath)
+        is_parquet = str(filepath).endswith(".parquet")
+
+        # Read the header first, so a file missing required columns fails
+        # before its rows are parsed and usecols can be given as the file's names.
+        # This is the only validation: usecols may leave out validated columns.
+        select = None
+        if validate_columns or usecols is not None:
+            header = self._read_header(filepath, is_parquet)
+            if validate_columns:
+                self._check_columns(header.rename(columns=column_mapping or {}), validate_columns)
+            if usecols is not None:
+                mapping = column_mapping or {}
+                select = [
+                    column for column in header.columns if mapping.get(column, column) in usecols
+                ]
+
+        # Read CSV (or Parquet). No selected columns means nothing to parse;
+        # pyarrow would otherwise read every column for an empty selection
+        if select == []:
+            df = pd.DataFrame()
+        elif is_parquet:
+            df = pd.read_parquet(filepath, columns=select)
+        else:
+            dtype = self._csv_dtypes(column_mapping)
+            if chunksize:
+                df = pd.concat(
+                    pd.read_csv(filepath, dtype=dtype, usecols=select, chunksize=chunksize),
+                    ignore_index=True,
+                )
+            elif PYARROW_AVAILABLE:
+                # pyarrow's multithreaded parser is faster, but cannot read in chunks
+                df = self._read_csv_pyarrow(filepath, dtype, select)
+            else:
+                df = pd.read_csv(filepath, dtype=dtype, usecols=select)
 
         # Apply column mapping if provided
         if column_mapping:
             df = df.rename(columns=column_mapping)
 
-        # Optional validation
-        if validate_columns and not self.validate_dataframe(df, validate_columns):
+        # Numeric columns are parsed untyped, so empty cells, large IDs and
+        # unevaluated values read fine, then narrowed where every value fits;
+        # the analyzer coerces anything left as text. Parquet columns that
+        # already have these types are left alone.
+        df = self.apply_dtypes(df, MEMORY_ANALYSIS_DTYPES)
+
+        return df
+
+    @staticmethod
+    def _read_header(filepath: str, is_parquet: bool) -> pd.DataFrame:
+        """
+        Read a file's column names without reading its rows.
+
+        Args:
+            filepath: Path to CSV or Parquet file
+            is_parquet: Whether the file is Parquet
+
+        Returns:
+            Empty DataFrame with the file's columns
+        """
+        if not is_parquet:
+            return pd.read_csv(filepath, nrows=0)
+        if PYARROW_AVAILABLE:
+            import pyarrow.parquet as pq
+
+            return pd.DataFrame(columns=pq.read_schema(filepath).names)
+        # Other Parquet engines cannot read the schema on its own
+        return pd.read_parquet(filepath).iloc[:0]
+
+    @staticmethod
+    def _read_csv_pyarrow(
+        filepath: str, dtype: Dict[str, str], select: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Parse a CSV with pyarrow's multithreaded reader.
+
+        read_csv(engine="pyarrow") infers every column's type before applying
+        dtype, so owner names such as "007" would come back as "7.0". Text
+        columns are declared to pyarrow instead, so they are never inferred.
+
+        Args:
+            filepath: Path to CSV file
+            dtype: Dict mapping CSV column names to dtypes, from _csv_dtypes
+            select: Optional list of CSV column names to read
+
+        Returns:
+            DataFrame with the selected columns
+        """
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        options = pa_csv.ConvertOptions(
+            column_types={column: pa.string() for column in dtype},
+            strings_can_be_null=True,
+            include_columns=select,
+        )
+        return pa_csv.read_csv(filepath, convert_options=options).to_pandas()
+
+    def _check_columns(self, df: pd.DataFrame, validate_columns: Set[str]) -> None:
+        """
+        Raise if df lacks any of the required columns.
+
+        Args:
+            df: DataFrame (or header-only DataFrame) with mapped column names
+            validate_columns: Set of required columns
+
+        Raises:
+            ValueError: If required columns are missing
+        """
+        if not self.validate_dataframe(df, validate_columns):
             missing = validate_columns - set(df.columns)
             raise ValueError(
                 f"CSV file missing required columns: {missing}. "
                 f"Available columns: {list(df.columns)}"
             )
 
-        return df
+    @staticmethod
+    def _csv_dtypes(column_mapping: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Build the read_csv dtype mapping for known columns.
+
+        Args:
+            column_mapping: Optional dict mapping CSV columns to desired names
+
+        Returns:
+            Dict mapping CSV column names (before renaming) to dtypes. Entries
+            for columns not present in the file are ignored by read_csv.
+            Numeric columns are left out: read_csv would fail on empty integer
+            cells or on text such as HTCondor's "undefined", so they are
+            narrowed after parsing instead.
+        """
+        known = {
+            column: dtype
+            for column, dtype in MEMORY_ANALYSIS_DTYPES.items()
+            if not is_numeric_dtype(dtype)
+        }
+        dtype = dict(known)
+        if column_mapping:
+            for source, target in column_mapping.items():
+                if target in known:
+                    dtype[source] = known[target]
+        return dtype
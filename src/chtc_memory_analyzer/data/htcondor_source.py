@@ -1,29 +1,60 @@
 """HTCondor data source"""
 
-from typing import List, Optional
+from operator import itemgetter
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
-from .base import DataSource
+from .base import MEMORY_ANALYSIS_DTYPES, DataSource
 
 try:
     import classad2 as classad
     import htcondor2 as htcondor
 
     HTCONDOR_AVAILABLE = True
+    # Attribute values are plain Python values or exactly this type, so an
+    # identity check on type() can replace isinstance on the per-value path
+    _EXPR_TREE = classad._expr_tree.ExprTree
 except ImportError:
     HTCONDOR_AVAILABLE = False
     classad = None
     htcondor = None
+    _EXPR_TREE = None
+
+# Core attributes needed for memory analysis, fetched when no projection is given
+DEFAULT_PROJECTION = (
+    "ClusterId",
+    "ProcId",
+    "Owner",
+    "RequestMemory",
+    "MemoryUsage",
+    "JobStatus",
+)
 
 
 class HTCondorSource(DataSource):
     """Fetch job data from HTCondor history API"""
 
+    def __init__(self):
+        """
+        Initialize HTCondor source.
+
+        Schedd handles and parsed constraints are kept on the source and reused
+        across fetch_jobs calls, so periodic queries skip locating the schedd
+        and re-parsing the expression. Use clear_cache() to reconnect.
+        """
+        self._schedds: Dict[Optional[str], Any] = {}
+        self._constraints: Dict[str, Any] = {}
+
+    def clear_cache(self) -> None:
+        """Drop cached schedd handles and parsed constraints."""
+        self._schedds.clear()
+        self._constraints.clear()
+
     def fetch_jobs(
         self,
         schedd: Optional[str] = None,
-        constraint: str = "JobStatus == 4",
+        constraint: Optional[str] = "JobStatus == 4",
         match_limit: int = 10000,
         attributes: Optional[List[str]] = None,
         fetch_all: bool = False,
@@ -33,7 +64,8 @@ class HTCondorSource(DataSource):
 
         Args:
             schedd: Schedd name to query (default: local schedd)
-            constraint: HTCondor constraint expression (default: completed jobs only)
+            constraint: HTCondor constraint expression (default: completed jobs only).
+                        None matches every job.
             match_limit: Maximum number of jobs to fetch (default: 10000)
             attributes: List of specific HTCondor attributes to fetch (e.g., ['ClusterId', 'Owner'])
             fetch_all: If True, fetch all available attributes (overrides attributes parameter)
@@ -59,60 +91,87 @@ class HTCondorSource(DataSource):
                 "HTCondor is not available. Install with: uv pip install -e '.[htcondor]'"
             )
 
-        # Connect to schedd
-        if schedd:
-            schedd_obj = htcondor.Schedd(schedd)
-        else:
-            schedd_obj = htcondor.Schedd()
+        # Connect to schedd, reusing the handle from an earlier call
+        if schedd not in self._schedds:
+            self._schedds[schedd] = htcondor.Schedd(schedd) if schedd else htcondor.Schedd()
+        schedd_obj = self._schedds[schedd]
 
         # Determine projection based on mode
         if fetch_all:
             projection = []  # Empty list = fetch all attributes
         elif attributes:
-            projection = attributes
+            projection = list(attributes)
         else:
             # Default: core attributes for memory analysis
-            projection = [
-                "ClusterId",
-                "ProcId",
-                "Owner",
-                "RequestMemory",
-                "MemoryUsage",
-                "JobStatus",
-            ]
+            projection = list(DEFAULT_PROJECTION)
 
         # Query history
         try:
+            # Only expression strings are parsed; None is passed through as is
+            if isinstance(constraint, str):
+                if constraint not in self._constraints:
+                    self._constraints[constraint] = classad.ExprTree(constraint)
+                constraint = self._constraints[constraint]
             ads = schedd_obj.history(
                 constraint=constraint, projection=projection, match=match_limit
             )
         except Exception as e:
+            # The schedd may have restarted or moved; reconnect on the next call
+            self._schedds.pop(schedd, None)
             raise RuntimeError(f"Error querying HTCondor history: {e}")
 
-        # Transform ClassAds to records
-        records = []
-        for ad in ads:
-            record = {}
-
-            # If we have a projection, use it; otherwise iterate all keys
-            keys_to_process = projection if projection else ad.keys()
-
-            for key in keys_to_process:
-                value = ad.get(key)
+        if projection:
+            # Known attributes: fill one list per column, which pandas turns
+            # into columns directly instead of inferring them row by row
+            columns = {key: [] for key in projection}
+            keys = list(columns)
+            # Bind the per-value callables once rather than looking them up per field;
+            # most values are plain, so evaluate() is only called for expressions
+            evaluate = self._evaluate
+            expr_tree = _EXPR_TREE
+            appends = [columns[key].append for key in keys]
+            getter = itemgetter(*keys)
+            single = len(keys) == 1
+            for ad in ads:
+                # Fetch every attribute in one call; ads missing one of them
+                # (e.g. jobs that never reported usage) fall back to get()
+                try:
+                    values = (getter(ad),) if single else getter(ad)
+                except KeyError:
+                    get = ad.get
+                    values = [get(key) for key in keys]
+                for append, value in zip(appends, values):
+                    append(evaluate(value) if type(value) is expr_tree else value)
+            df = pd.DataFrame(columns)
+        else:
+            # All attributes: ads may differ in keys, so build one record per ad
+            records = [{key: self._evaluate(ad.get(key)) for key in ad.keys()} for ad in ads]
+            df = pd.DataFrame(records)
 
-                # Handle ExprTree evaluation
-                if value is not None and isinstance(value, classad._expr_tree.ExprTree):
-                    try:
-                        value = value.eval()
-                    except Exception:
-                        # If evaluation fails, convert to string representation
-                        value = str(value)
+        # Expressions that failed to evaluate were kept as strings; coerce the
+        # memory columns once so analysis works on plain numeric columns
+        for column in ("RequestMemory", "MemoryUsage"):
+            if column in df.columns:
+                df[column] = pd.to_numeric(df[column], errors="coerce")
 
-                record[key] = value
+        return self.apply_dtypes(df, MEMORY_ANALYSIS_DTYPES)
 
-            records.append(record)
+    @staticmethod
+    def _evaluate(value):
+        """
+        Evaluate a ClassAd expression to a plain value.
 
-        # Create DataFrame
-        df = pd.DataFrame(records)
+        Args:
+            value: Attribute value from a ClassAd
 
-        return df
+        Returns:
+            The evaluated value for an ExprTree (its string form if evaluation
+            fails); any other value unchanged
+        """
+        if type(value) is _EXPR_TREE:
+            try:
+                return value.eval()
+            except Exception:
+                # If evaluation fails, convert to string representation
+                return str(value)
+        return value
@@ -1,20 +1,47 @@
 """Data formatting utilities"""
 
-from typing import Any, Dict
+import heapq
+import io
+import math
+from typing import Any, Dict, Optional
+
+import numpy as np
 
 from .histogram import create_histogram
 
+_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+_RULE = "=" * 80
+
+
+_USER_TEMPLATE = (
+    "\n\nUser: {owner}"
+    "\n  Clusters: {cluster_count} (IDs: {cluster_ids})"
+    "\n  Total Jobs: {total_jobs}"
+    "\n  Total Requested Memory: {requested}"
+    "\n  Total Used Memory: {used}"
+)
+
+
+def _total_jobs(item):
+    """Sort key for (owner, totals) pairs of user_totals"""
+    return item[1]["total_jobs"]
+
 
 def format_bytes(bytes_value):
     """Convert bytes to human-readable format"""
     if bytes_value is None:
         return "N/A"
 
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if bytes_value < 1024.0:
-            return f"{bytes_value:.2f} {unit}"
-        bytes_value /= 1024.0
-    return f"{bytes_value:.2f} PB"
+    if bytes_value < 1024:
+        return f"{bytes_value:.2f} B"
+
+    # Each unit is 2**10 times the previous one, so the unit index follows from
+    # the bit length of the integer part (NaN and inf stay in the largest unit)
+    exp = len(_UNITS) - 1
+    if math.isfinite(bytes_value):
+        exp = min((int(bytes_value).bit_length() - 1) // 10, exp)
+    return f"{bytes_value / (1 << (10 * exp)):.2f} {_UNITS[exp]}"
 
 
 def format_cluster_report(analysis: Dict) -> str:
@@ -22,113 +49,136 @@ def format_cluster_report(analysis: Dict) -> str:
     cluster_id = analysis["cluster_id"]
     job_count = analysis["job_count"]
     owner = analysis["owner"]
-
-    lines = []
-    lines.append("\n" + "=" * 80)
-    lines.append(f"Cluster: {cluster_id} | Owner: {owner} | Jobs: {job_count}")
-    lines.append("=" * 80)
+    memory = analysis["memory"]
+    mem_use_stats = memory["used"]
+    mem_ratio_stats = memory["ratios"]
+    used_memory = analysis["raw_data"]["used_memory"]
+
+    # Each line after the first is written with its leading newline
+    buf = io.StringIO()
+    write = buf.write
+    write("\n" + _RULE)
+    write(f"\nCluster: {cluster_id} | Owner: {owner} | Jobs: {job_count}")
+    write("\n" + _RULE)
 
     # Memory Analysis
-    lines.append(f"\nMEMORY REQUEST: {analysis.get('memory', {}).get('requested', {})}")
-    lines.append("\nMEMORY USAGE:")
-    lines.append("-" * 80)
-    mem_use_stats = analysis["memory"]["used"]
-    mem_ratio_stats = analysis["memory"]["ratios"]
-
-    lines.append("  Used Memory (MB):")
-    lines.append(
-        "    Mean: {:.2f} | Median: {:.2f} | Std Dev: {:.2f}".format(
+    write(f"\n\nMEMORY REQUEST: {memory.get('requested', {})}")
+    write("\n\nMEMORY USAGE:")
+    write("\n" + "-" * 80)
+    write("\n  Used Memory (MB):")
+    write(
+        "\n    Mean: {:.2f} | Median: {:.2f} | Std Dev: {:.2f}".format(
             mem_use_stats["mean"], mem_use_stats["median"], mem_use_stats["stdev"]
         )
     )
-    lines.append("    Min: {:.2f} | Max: {:.2f}".format(mem_use_stats["min"], mem_use_stats["max"]))
+    write("\n    Min: {:.2f} | Max: {:.2f}".format(mem_use_stats["min"], mem_use_stats["max"]))
 
     if mem_ratio_stats["count"] > 0:
         avg_ratio = mem_ratio_stats["mean"]
-        lines.append("\n  Usage Ratio (Used/Requested):")
-        lines.append(
-            "    Mean: {:.2%} | Median: {:.2%}".format(avg_ratio, mem_ratio_stats["median"])
-        )
+        write("\n\n  Usage Ratio (Used/Requested):")
+        write("\n    Mean: {:.2%} | Median: {:.2%}".format(avg_ratio, mem_ratio_stats["median"]))
 
     # Memory histogram
-    if analysis["raw_data"]["used_memory"]:
-        lines.append("\n  Memory Usage Histogram (MB):")
-        lines.append(create_histogram(analysis["raw_data"]["used_memory"]))
+    if len(used_memory) > 0:
+        write("\n\n  Memory Usage Histogram (MB):")
+        write("\n" + create_histogram(used_memory))
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
-def format_summary_report(results: Dict[str, Any]) -> str:
-    """Format overall summary report"""
-    import statistics
+def format_summary_report(results: Dict[str, Any], top_users: Optional[int] = None) -> str:
+    """
+    Format overall summary report.
 
-    lines = []
+    Args:
+        results: Results dict from MemoryAnalyzer.analyze
+        top_users: Optional number of users (by total jobs) to list; all users if None
+
+    Returns:
+        Report text
+    """
     analyses = results.get("cluster_analyses", [])
     user_totals = results.get("user_totals", {})
     over_allocators = results.get("over_allocators", [])
 
-    # Summary header
-    lines.append("\n\n" + "=" * 80)
-    lines.append("SUMMARY")
-    lines.append("=" * 80)
-    lines.append(f"Total clusters analyzed: {len(analyses)}")
-
-    # Collect all memory usage data across all clusters
-    all_memory_usage = []
-    for analysis in analyses:
-        all_memory_usage.extend(analysis["raw_data"]["used_memory"])
-
-    if all_memory_usage:
-        lines.append("\n" + "=" * 80)
-        lines.append("MEMORY USAGE HISTOGRAM - ALL CLUSTERS")
-        lines.append("=" * 80)
-        lines.append(f"Total jobs with memory data: {len(all_memory_usage)}")
+    # Summary header; each line after the first is written with its leading newline
+    buf = io.StringIO()
+    write = buf.write
+    write("\n\n" + _RULE)
+    write("\nSUMMARY")
+    write("\n" + _RULE)
+    write(f"\nTotal clusters analyzed: {len(analyses)}")
+
+    # Memory usage data across all clusters as one array, shared by the
+    # stats and the histogram; results from MemoryAnalyzer already carry it
+    all_memory_usage = results.get("all_used_memory")
+    if all_memory_usage is None:
+        arrays = [
+            np.asarray(analysis["raw_data"]["used_memory"], dtype=np.float32)
+            for analysis in analyses
+        ]
+        all_memory_usage = np.concatenate(arrays) if arrays else np.empty(0, np.float32)
+
+    if len(all_memory_usage) > 0:
+        write("\n\n" + _RULE)
+        write("\nMEMORY USAGE HISTOGRAM - ALL CLUSTERS")
+        write("\n" + _RULE)
+        write(f"\nTotal jobs with memory data: {len(all_memory_usage)}")
 
         from ..analysis.stats import calculate_stats
 
         mem_stats = calculate_stats(all_memory_usage)
-        lines.append(
-            "Mean: {:.2f} MB | Median: {:.2f} MB | Std Dev: {:.2f} MB".format(
+        write(
+            "\nMean: {:.2f} MB | Median: {:.2f} MB | Std Dev: {:.2f} MB".format(
                 mem_stats["mean"], mem_stats["median"], mem_stats["stdev"]
             )
         )
-        lines.append("Min: {:.2f} MB | Max: {:.2f} MB".format(mem_stats["min"], mem_stats["max"]))
-        lines.append("\nHistogram:")
-        lines.append(create_histogram(all_memory_usage))
+        write("\nMin: {:.2f} MB | Max: {:.2f} MB".format(mem_stats["min"], mem_stats["max"]))
+        write("\n\nHistogram:")
+        write("\n" + create_histogram(all_memory_usage))
 
     # Per-user totals
     if user_totals:
-        lines.append("\n" + "=" * 80)
-        lines.append("PER-USER TOTALS ACROSS ALL CLUSTERS")
-        lines.append("=" * 80)
+        write("\n\n" + _RULE)
+        write("\nPER-USER TOTALS ACROSS ALL CLUSTERS")
+        write("\n" + _RULE)
 
-        # Sort users by total jobs
-        sorted_users = sorted(user_totals.items(), key=lambda x: x[1]["total_jobs"], reverse=True)
+        # Sort users by total jobs; only the top entries need ordering when capped
+        if top_users is None:
+            sorted_users = sorted(user_totals.items(), key=_total_jobs, reverse=True)
+        else:
+            sorted_users = heapq.nlargest(top_users, user_totals.items(), key=_total_jobs)
 
         for owner, totals in sorted_users:
-            lines.append(f"\nUser: {owner}")
-            cluster_ids = ", ".join(map(str, sorted(totals["clusters"])))
-            lines.append(f"  Clusters: {len(totals['clusters'])} (IDs: {cluster_ids})")
-            lines.append(f"  Total Jobs: {totals['total_jobs']}")
-            req_mem_bytes = totals["total_requested_memory"] * 1024 * 1024
-            lines.append(f"  Total Requested Memory: {format_bytes(req_mem_bytes)}")
-            used_mem_bytes = totals["total_used_memory"] * 1024 * 1024
-            lines.append(f"  Total Used Memory: {format_bytes(used_mem_bytes)}")
-
-            if totals["memory_ratios"]:
-                avg_ratio = statistics.mean(totals["memory_ratios"])
-                lines.append(f"  Average Memory Usage Ratio: {avg_ratio:.2%}")
-
-                if totals["total_requested_memory"] > 0:
-                    overall_ratio = totals["total_used_memory"] / totals["total_requested_memory"]
-                    lines.append(f"  Overall Memory Usage Ratio: {overall_ratio:.2%}")
+            clusters = totals["clusters"]
+            requested = totals["total_requested_memory"]
+            used = totals["total_used_memory"]
+            ratios = totals["memory_ratios"]
+            write(
+                _USER_TEMPLATE.format(
+                    owner=owner,
+                    cluster_count=len(clusters),
+                    cluster_ids=", ".join(map(str, sorted(clusters))),
+                    total_jobs=totals["total_jobs"],
+                    requested=format_bytes(requested * 1024 * 1024),
+                    used=format_bytes(used * 1024 * 1024),
+                )
+            )
+
+            if ratios:
+                avg_ratio = float(np.mean(ratios))
+                write(f"\n  Average Memory Usage Ratio: {avg_ratio:.2%}")
+
+                if requested > 0:
+                    overall_ratio = used / requested
+                    write(f"\n  Overall Memory Usage Ratio: {overall_ratio:.2%}")
 
     # Over-allocators
     if over_allocators:
-        lines.append("\n" + "=" * 80)
-        lines.append("Top Memory Over-Allocators (using <50% of requested):")
-        lines.append("=" * 80)
+        write("\n\n" + _RULE)
+        write("\nTop Memory Over-Allocators (using <50% of requested):")
+        write("\n" + _RULE)
         for cid, owner, ratio in over_allocators[:10]:
-            lines.append(f"  Cluster {cid} ({owner}): {ratio:.1%} average usage")
+            write(f"\n  Cluster {cid} ({owner}): {ratio:.1%} average usage")
 
-    return "\n".join(lines)
+    return buf.getvalue()
@@ -1,44 +1,51 @@
 """ASCII histogram generation"""
 
-import math
-from typing import List
+from typing import List, Union
 
+import numpy as np
 
-def create_histogram(values: List[float], bins: int = 10, width: int = 50) -> str:
+# Bars are sliced from one prebuilt string rather than repeated per bin
+_BAR_POOL = "█" * 1024
+
+
+def create_histogram(
+    values: Union[List[float], np.ndarray], bins: int = 10, width: int = 50
+) -> str:
     """Create a simple ASCII histogram"""
-    if not values:
+    if len(values) == 0:
         return "No data"
 
+    # Float arrays (e.g. float32 memory usage) are used as is, without a copy
+    arr = np.asarray(values)
+    if arr.dtype.kind != "f":
+        arr = arr.astype(np.float64)
+
     # Filter out NaN values
-    valid_values = [v for v in values if not math.isnan(v)]
+    arr = arr[~np.isnan(arr)]
 
-    if not valid_values:
+    if arr.size == 0:
         return "No valid data (all NaN)"
 
-    min_val = min(valid_values)
-    max_val = max(valid_values)
+    min_val = arr.min()
+    max_val = arr.max()
 
     if min_val == max_val:
         return f"All values equal: {min_val:.2f}"
 
-    # Create bins
-    bin_width = (max_val - min_val) / bins
-    bin_counts = [0] * bins
-
-    for val in valid_values:
-        bin_idx = min(int((val - min_val) / bin_width), bins - 1)
-        bin_counts[bin_idx] += 1
+    # Count values per bin in one vectorized pass; passing the range lets
+    # np.histogram reuse min/max instead of scanning the array for them again
+    bin_counts, bin_edges = np.histogram(arr, bins=bins, range=(min_val, max_val))
 
-    # Find max count for scaling
-    max_count = max(bin_counts)
+    # Scale bars to the largest bin
+    bar_lengths = bin_counts * width // bin_counts.max()
 
     # Build histogram
+    pool = _BAR_POOL if width <= len(_BAR_POOL) else "█" * width
     histogram = []
-    for i, count in enumerate(bin_counts):
-        bin_start = min_val + i * bin_width
-        bin_end = bin_start + bin_width
-        bar_length = int((count / max_count) * width) if max_count > 0 else 0
-        bar = "█" * bar_length
+    for bin_start, bin_end, count, bar_length in zip(
+        bin_edges[:-1].tolist(), bin_edges[1:].tolist(), bin_counts.tolist(), bar_lengths.tolist()
+    ):
+        bar = pool[:bar_length]
         histogram.append(f"  {bin_start:8.2f} - {bin_end:8.2f} | {bar} ({count})")
 
     return "\n".join(histogram)
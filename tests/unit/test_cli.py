@@ -0,0 +1,94 @@
+"""Tests for the chtc-analyze command"""
+
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from chtc_memory_analyzer import cli
+from chtc_memory_analyzer.data import csv_source
+from chtc_memory_analyzer.data.base import PYARROW_AVAILABLE
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def missing_pyarrow(monkeypatch):
+    """Make every Parquet read and write fail as if pyarrow were not installed"""
+
+    def no_pyarrow(*args, **kwargs):
+        raise ImportError("Unable to find a usable engine")
+
+    monkeypatch.setattr(pd, "read_parquet", no_pyarrow)
+    monkeypatch.setattr(csv_source, "PYARROW_AVAILABLE", False)
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", no_pyarrow)
+
+
+@pytest.fixture
+def htcondor_jobs(monkeypatch, sample_job_data):
+    """Serve sample_job_data in place of an HTCondor query"""
+    source = Mock()
+    source.return_value.fetch_jobs.return_value = pd.DataFrame(sample_job_data)
+    monkeypatch.setattr(cli, "HTCondorSource", source)
+
+
+class TestParquetWithoutPyarrow:
+    def test_cache_reports_missing_pyarrow(self, htcondor_jobs, missing_pyarrow, tmp_path):
+        result = CliRunner().invoke(cli.main, ["--cache-csv", str(tmp_path / "jobs.parquet")])
+
+        assert result.exit_code == 0
+        assert cli.PARQUET_INSTALL_HINT in result.output
+
+    def test_read_reports_missing_pyarrow(self, missing_pyarrow, tmp_path):
+        path = tmp_path / "jobs.parquet"
+        path.touch()
+
+        result = CliRunner().invoke(cli.main, ["--csv", str(path)])
+
+        assert result.exit_code == 0
+        assert cli.PARQUET_INSTALL_HINT in result.output
+
+
+class TestTopUsers:
+    def test_lists_every_user_by_default(self, htcondor_jobs):
+        result = CliRunner().invoke(cli.main, ["--min-jobs", "1"])
+
+        assert result.exit_code == 0
+        assert "User: user1" in result.output
+        assert "User: user2" in result.output
+
+    def test_limits_summary_to_top_users(self, htcondor_jobs):
+        result = CliRunner().invoke(cli.main, ["--min-jobs", "1", "--top-users", "1"])
+
+        assert result.exit_code == 0
+        assert "User: user1" in result.output
+        assert "User: user2" not in result.output
+
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+class TestParquetCache:
+    def test_mixed_type_attributes_are_cached(self, monkeypatch, sample_job_data, tmp_path):
+        jobs = pd.DataFrame(sample_job_data).assign(LastHoldReason=[1, "undefined", None])
+        source = Mock()
+        source.return_value.fetch_jobs.return_value = jobs
+        monkeypatch.setattr(cli, "HTCondorSource", source)
+        path = tmp_path / "jobs.parquet"
+
+        result = CliRunner().invoke(cli.main, ["--fetch-all", "--cache-csv", str(path)])
+
+        assert result.exit_code == 0
+        cached = pd.read_parquet(path)
+        assert cached["LastHoldReason"].tolist() == ["1", "undefined", None]
+        assert cached["ClusterId"].tolist() == [1, 1, 2]
+
+    def test_write_error_is_reported(self, monkeypatch, htcondor_jobs, tmp_path):
+        def unwritable(*args, **kwargs):
+            raise ValueError("cannot convert")
+
+        monkeypatch.setattr(pd.DataFrame, "to_parquet", unwritable)
+
+        result = CliRunner().invoke(cli.main, ["--cache-csv", str(tmp_path / "jobs.parquet")])
+
+        assert result.exit_code == 0
+        assert "Error writing Parquet cache: cannot convert" in result.output
@@ -0,0 +1,272 @@
+"""Tests for the CSV and HTCondor data sources and shared DataSource helpers"""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from chtc_memory_analyzer.analysis import MemoryAnalyzer
+from chtc_memory_analyzer.data import CSVSource, HTCondorSource, htcondor_source
+from chtc_memory_analyzer.data.base import MEMORY_ANALYSIS_DTYPES, PYARROW_AVAILABLE, DataSource
+
+pytestmark = pytest.mark.unit
+
+
+class TestApplyDtypes:
+    def test_narrows_known_columns(self, sample_job_data):
+        df = DataSource.apply_dtypes(pd.DataFrame(sample_job_data), MEMORY_ANALYSIS_DTYPES)
+
+        assert df["ClusterId"].dtype == np.int32
+        assert df["JobStatus"].dtype == np.int8
+        assert df["MemoryUsage"].dtype == np.float32
+
+    def test_integer_column_with_missing_values_is_kept(self):
+        df = pd.DataFrame({"ProcId": [0.0, np.nan], "JobStatus": pd.array([4, None], "Int64")})
+        DataSource.apply_dtypes(df, MEMORY_ANALYSIS_DTYPES)
+
+        assert df["ProcId"].dtype == np.float64
+        assert df["JobStatus"].dtype == "Int64"
+
+    def test_out_of_range_integers_do_not_wrap(self):
+        df = DataSource.apply_dtypes(
+            pd.DataFrame({"ClusterId": [3000000000, 1]}), MEMORY_ANALYSIS_DTYPES
+        )
+
+        assert df["ClusterId"].tolist() == [3000000000, 1]
+
+    def test_unparseable_text_is_kept(self):
+        df = DataSource.apply_dtypes(
+            pd.DataFrame({"MemoryUsage": ["undefined", "3"]}), MEMORY_ANALYSIS_DTYPES
+        )
+
+        assert df["MemoryUsage"].tolist() == ["undefined", "3"]
+
+
+@pytest.fixture
+def write_csv(tmp_path):
+    """Write CSV text to a file and return its path"""
+
+    def write(text, name="jobs.csv"):
+        path = tmp_path / name
+        path.write_text(text)
+        return str(path)
+
+    return write
+
+
+class TestCSVSourceIntegers:
+    def test_empty_integer_cells(self, write_csv):
+        path = write_csv("ClusterId,ProcId,JobStatus\n1,0,4\n1,,\n")
+
+        for chunksize in (None, 1):
+            df = CSVSource().fetch_jobs(path, chunksize=chunksize)
+            assert df["ProcId"].isna().tolist() == [False, True]
+            assert df["JobStatus"].isna().tolist() == [False, True]
+            assert df["ClusterId"].dtype == np.int32
+
+    def test_large_cluster_ids_do_not_wrap(self, write_csv):
+        path = write_csv("ClusterId,ProcId\n3000000000,0\n")
+
+        assert CSVSource().fetch_jobs(path)["ClusterId"].tolist() == [3000000000]
+
+    def test_mapped_integer_columns_are_narrowed(self, write_csv):
+        path = write_csv("cluster,status\n1,4\n")
+        df = CSVSource().fetch_jobs(
+            path, column_mapping={"cluster": "ClusterId", "status": "JobStatus"}
+        )
+
+        assert df["ClusterId"].dtype == np.int32
+        assert df["JobStatus"].dtype == np.int8
+
+
+class TestCSVSourceFloats:
+    def test_undefined_memory_usage(self, write_csv):
+        path = write_csv(
+            "ClusterId,Owner,RequestMemory,MemoryUsage\n"
+            "1,user1,1000,800\n1,user1,1000,undefined\n1,user1,1000,\n"
+        )
+
+        for chunksize in (None, 1):
+            df = CSVSource().fetch_jobs(path, chunksize=chunksize)
+            assert df["RequestMemory"].dtype == np.float32
+            results = MemoryAnalyzer(min_jobs=1).analyze(df)
+            assert results["cluster_analyses"][0]["memory"]["used"]["mean"] == 800
+
+    def test_memory_columns_are_float32(self, write_csv):
+        path = write_csv("RequestMemory,MemoryUsage\n1000,800.5\n")
+        df = CSVSource().fetch_jobs(path)
+
+        assert df["RequestMemory"].dtype == np.float32
+        assert df["MemoryUsage"].tolist() == [800.5]
+
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+class TestCSVSourceParquet:
+    @pytest.fixture
+    def parquet_path(self, tmp_path):
+        path = tmp_path / "jobs.parquet"
+        pd.DataFrame(
+            {"cluster": [1, 2], "Owner": ["user1", "user2"], "Extra": [1.0, 2.0]}
+        ).to_parquet(path)
+        return str(path)
+
+    def test_usecols_are_mapped_before_reading(self, parquet_path):
+        df = CSVSource().fetch_jobs(
+            parquet_path,
+            column_mapping={"cluster": "ClusterId"},
+            usecols={"ClusterId", "Owner"},
+        )
+
+        assert list(df.columns) == ["ClusterId", "Owner"]
+
+    def test_dtypes_apply_to_mapped_columns(self, parquet_path):
+        df = CSVSource().fetch_jobs(parquet_path, column_mapping={"cluster": "ClusterId"})
+
+        assert df["ClusterId"].dtype == np.int32
+
+    def test_no_matching_columns(self, parquet_path):
+        df = CSVSource().fetch_jobs(parquet_path, usecols={"MemoryUsage"})
+
+        assert list(df.columns) == []
+
+    def test_schema_is_validated(self, parquet_path):
+        with pytest.raises(ValueError, match="missing required columns"):
+            CSVSource().fetch_jobs(parquet_path, validate_columns={"ClusterId"})
+
+
+class TestCSVSourceUsecols:
+    def test_no_matching_columns(self, write_csv):
+        path = write_csv("ClusterId,Owner\n1,user1\n")
+
+        for chunksize in (None, 1):
+            df = CSVSource().fetch_jobs(path, chunksize=chunksize, usecols={"MemoryUsage"})
+            assert df.empty
+            assert list(df.columns) == []
+
+    def test_no_matching_columns_still_validated(self, write_csv):
+        path = write_csv("ClusterId,Owner\n1,user1\n")
+
+        with pytest.raises(ValueError, match="missing required columns"):
+            CSVSource().fetch_jobs(path, usecols={"MemoryUsage"}, validate_columns={"MemoryUsage"})
+
+    def test_validated_columns_outside_usecols(self, write_csv):
+        path = write_csv("ClusterId,Owner\n1,user1\n")
+
+        df = CSVSource().fetch_jobs(
+            path, usecols={"ClusterId"}, validate_columns={"ClusterId", "Owner"}
+        )
+
+        assert list(df.columns) == ["ClusterId"]
+
+
+class _ExprTree:
+    """Stand-in for classad.ExprTree that records the parsed expression"""
+
+    def __init__(self, expression):
+        self.expression = expression
+
+    def eval(self):
+        return float(self.expression)
+
+    def __str__(self):
+        return self.expression
+
+
+@pytest.fixture
+def htcondor(monkeypatch, mock_htcondor_schedd, sample_job_data):
+    """Replace the htcondor bindings with a mock whose schedd returns sample ads"""
+    mock_htcondor_schedd.history.return_value = sample_job_data
+    module = Mock()
+    module.Schedd.return_value = mock_htcondor_schedd
+    classad = Mock()
+    classad.ExprTree = _ExprTree
+    monkeypatch.setattr(htcondor_source, "HTCONDOR_AVAILABLE", True)
+    monkeypatch.setattr(htcondor_source, "htcondor", module)
+    monkeypatch.setattr(htcondor_source, "classad", classad)
+    monkeypatch.setattr(htcondor_source, "_EXPR_TREE", _ExprTree)
+    return module
+
+
+class TestHTCondorSourceCache:
+    def test_constraint_is_parsed_once(self, htcondor, mock_htcondor_schedd):
+        source = HTCondorSource()
+        source.fetch_jobs()
+        source.fetch_jobs()
+
+        first, second = mock_htcondor_schedd.history.call_args_list
+        assert first.kwargs["constraint"].expression == "JobStatus == 4"
+        assert second.kwargs["constraint"] is first.kwargs["constraint"]
+
+    def test_none_constraint_is_passed_through(self, htcondor, mock_htcondor_schedd):
+        HTCondorSource().fetch_jobs(constraint=None)
+
+        assert mock_htcondor_schedd.history.call_args.kwargs["constraint"] is None
+
+    def test_schedd_is_reused_per_source(self, htcondor):
+        source = HTCondorSource()
+        source.fetch_jobs(schedd="a")
+        source.fetch_jobs(schedd="a")
+        assert htcondor.Schedd.call_count == 1
+
+        HTCondorSource().fetch_jobs(schedd="a")
+        assert htcondor.Schedd.call_count == 2
+
+    def test_failed_query_reconnects(self, htcondor, mock_htcondor_schedd):
+        source = HTCondorSource()
+        mock_htcondor_schedd.history.side_effect = OSError("schedd unreachable")
+        with pytest.raises(RuntimeError, match="schedd unreachable"):
+            source.fetch_jobs()
+
+        mock_htcondor_schedd.history.side_effect = None
+        source.fetch_jobs()
+
+        assert htcondor.Schedd.call_count == 2
+
+    def test_clear_cache_reconnects(self, htcondor):
+        source = HTCondorSource()
+        source.fetch_jobs()
+        source.clear_cache()
+        source.fetch_jobs()
+
+        assert htcondor.Schedd.call_count == 2
+
+
+class TestHTCondorSourceFetchAll:
+    @pytest.mark.parametrize("match_limit", [-1, 0, 10000])
+    def test_keeps_every_returned_ad(self, htcondor, sample_job_data, match_limit):
+        df = HTCondorSource().fetch_jobs(fetch_all=True, match_limit=match_limit)
+
+        assert len(df) == len(sample_job_data)
+        assert df["ClusterId"].tolist() == [1, 1, 2]
+
+
+class TestCSVSourceStrings:
+    def test_owner_text_is_not_inferred(self, write_csv):
+        path = write_csv("ClusterId,Owner\n1,007\n2,1e3\n")
+
+        for chunksize in (None, 10):
+            df = CSVSource().fetch_jobs(path, chunksize=chunksize)
+            assert df["Owner"].tolist() == ["007", "1e3"]
+
+    def test_mapped_owner_text_is_not_inferred(self, write_csv):
+        path = write_csv("ClusterId,user\n1,007\n")
+
+        for chunksize in (None, 10):
+            df = CSVSource().fetch_jobs(
+                path, chunksize=chunksize, column_mapping={"user": "Owner"}, usecols={"Owner"}
+            )
+            assert df["Owner"].tolist() == ["007"]
+
+
+class TestHTCondorSourceProjection:
+    def test_expressions_are_evaluated(self, htcondor, mock_htcondor_schedd, sample_job_data):
+        sample_job_data[0]["MemoryUsage"] = _ExprTree("750")
+        sample_job_data[1]["MemoryUsage"] = _ExprTree("undefined")
+        del sample_job_data[2]["MemoryUsage"]
+
+        df = HTCondorSource().fetch_jobs()
+
+        assert df["MemoryUsage"].tolist()[:1] == [750]
+        assert df["MemoryUsage"].isna().tolist() == [False, True, True]
+        assert df["Owner"].tolist() == ["user1", "user1", "user2"]
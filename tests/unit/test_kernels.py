@@ -0,0 +1,142 @@
+"""Tests for the grouped statistics kernels"""
+
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from chtc_memory_analyzer.analysis import _kernels
+from chtc_memory_analyzer.analysis._kernels import group_median, group_stats
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def grouped_values():
+    """float32 values with missing entries spread over 50 groups (group 7 left empty)"""
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, 50, 5000)
+    codes[codes == 7] = 8
+    values = rng.uniform(10, 4000, 5000).astype(np.float32)
+    values[rng.random(5000) < 0.1] = np.nan
+    return codes, values
+
+
+def pandas_stats(codes, values, ngroups):
+    """Reference per-group stats from a pandas groupby"""
+    grouped = pd.Series(values.astype(np.float64)).groupby(codes)
+    stats = grouped.agg(["count", "mean", "std", "min", "max"]).reindex(range(ngroups))
+    stats["count"] = stats["count"].fillna(0)
+    return stats
+
+
+class TestGroupStats:
+    def test_matches_pandas_groupby(self, grouped_values):
+        codes, values = grouped_values
+        count, mean, stdev, minimum, maximum = group_stats(codes, values, 50)
+        expected = pandas_stats(codes, values, 50)
+
+        nonempty = count > 0
+        np.testing.assert_array_equal(count, expected["count"])
+        np.testing.assert_allclose(mean[nonempty], expected["mean"][nonempty], rtol=1e-9)
+        np.testing.assert_allclose(stdev[nonempty], expected["std"][nonempty], rtol=1e-9)
+        np.testing.assert_array_equal(minimum[nonempty], expected["min"][nonempty])
+        np.testing.assert_array_equal(maximum[nonempty], expected["max"][nonempty])
+
+    def test_nan_values_are_skipped(self):
+        codes = np.array([0, 0, 0, 1])
+        values = np.array([1.0, np.nan, 3.0, np.nan])
+        count, mean, stdev, minimum, maximum = group_stats(codes, values, 2)
+
+        assert count.tolist() == [2, 0]
+        assert mean[0] == pytest.approx(2.0)
+        assert stdev[0] == pytest.approx(np.sqrt(2.0))
+        assert (minimum[0], maximum[0]) == (1.0, 3.0)
+
+    def test_single_value_group_has_nan_stdev(self):
+        count, mean, stdev, minimum, maximum = group_stats(np.array([0]), np.array([5.0]), 1)
+
+        assert count.tolist() == [1]
+        assert mean[0] == minimum[0] == maximum[0] == 5.0
+        assert np.isnan(stdev[0])
+
+    def test_empty_group_has_zero_count(self):
+        count, _, stdev, _, _ = group_stats(np.array([0, 0, 2]), np.array([1.0, 2.0, 3.0]), 3)
+
+        assert count.tolist() == [2, 0, 1]
+        assert np.isnan(stdev[1])
+
+    def test_integer_values(self):
+        count, mean, _, _, _ = group_stats(np.array([0, 0]), np.array([1, 2]), 1)
+
+        assert count.tolist() == [2]
+        assert mean[0] == pytest.approx(1.5)
+
+
+class TestGroupMedian:
+    def test_matches_pandas_groupby(self, grouped_values):
+        codes, values = grouped_values
+        medians = group_median(codes, values, 50)
+        expected = pd.Series(values.astype(np.float64)).groupby(codes).median()
+
+        np.testing.assert_allclose(medians[expected.index], expected, rtol=1e-9)
+
+    def test_even_and_odd_group_sizes(self):
+        codes = np.array([0, 0, 0, 1, 1, 1, 1])
+        values = np.array([3.0, 1.0, 2.0, 4.0, 1.0, 3.0, 2.0])
+
+        assert group_median(codes, values, 2).tolist() == [2.0, 2.5]
+
+    def test_nan_values_are_skipped(self):
+        codes = np.array([0, 0, 0, 0])
+        values = np.array([np.nan, 1.0, 5.0, np.nan])
+
+        assert group_median(codes, values, 1).tolist() == [3.0]
+
+    def test_empty_and_all_missing_groups_are_nan(self):
+        codes = np.array([0, 2, 2])
+        values = np.array([1.0, np.nan, np.nan])
+        medians = group_median(codes, values, 3)
+
+        assert medians[0] == 1.0
+        assert np.isnan(medians[1])
+        assert np.isnan(medians[2])
+
+    def test_unsorted_codes(self):
+        codes = np.array([1, 0, 1, 0, 1])
+        values = np.array([10.0, 2.0, 30.0, 4.0, 20.0])
+
+        assert group_median(codes, values, 2).tolist() == [3.0, 20.0]
+
+
+@pytest.mark.skipif(not _kernels.NUMBA_AVAILABLE, reason="numba not installed")
+class TestJitKernel:
+    def test_matches_numpy_kernel(self, grouped_values):
+        codes, values = grouped_values
+        codes = codes.astype(np.intp)
+        jit = _kernels._group_moments_jit()(codes, values, 50)
+        numpy = _kernels._group_moments_numpy(codes, values, 50)
+
+        np.testing.assert_array_equal(jit[0], numpy[0])
+        for jit_result, numpy_result in zip(jit[1:], numpy[1:]):
+            nonempty = numpy[0] > 0
+            np.testing.assert_allclose(jit_result[nonempty], numpy_result[nonempty], rtol=1e-9)
+
+    def test_group_stats_uses_jit_for_large_inputs(self, monkeypatch, grouped_values):
+        codes, values = grouped_values
+        monkeypatch.setattr(_kernels, "JIT_MIN_SIZE", 1)
+        jit = group_stats(codes, values, 50)
+        monkeypatch.setattr(_kernels, "JIT_MIN_SIZE", len(values) + 1)
+        numpy = group_stats(codes, values, 50)
+
+        nonempty = numpy[0] > 0
+        np.testing.assert_array_equal(jit[0], numpy[0])
+        for jit_result, numpy_result in zip(jit[1:], numpy[1:]):
+            np.testing.assert_allclose(jit_result[nonempty], numpy_result[nonempty], rtol=1e-9)
+
+    def test_numba_is_imported_on_first_use(self):
+        code = "import sys; import chtc_memory_analyzer.analysis; assert 'numba' not in sys.modules"
+
+        subprocess.run([sys.executable, "-c", code], check=True)
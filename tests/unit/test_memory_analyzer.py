@@ -0,0 +1,160 @@
+"""Tests for MemoryAnalyzer"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from chtc_memory_analyzer.analysis import MemoryAnalyzer, calculate_stats
+from chtc_memory_analyzer.visualization import format_summary_report
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def jobs_with_missing_usage():
+    """Two clusters for one owner; some jobs never reported MemoryUsage"""
+    return pd.DataFrame(
+        {
+            "ClusterId": [1, 1, 1, 2, 2],
+            "Owner": ["user1"] * 5,
+            "RequestMemory": [1000, 1000, 1000, 2000, 2000],
+            "MemoryUsage": [500, np.nan, 700, 900, np.nan],
+        }
+    )
+
+
+class TestMissingUsage:
+    """Jobs without a MemoryUsage value are counted at their cluster's mean usage"""
+
+    def test_cluster_stats_count_jobs(self, jobs_with_missing_usage):
+        results = MemoryAnalyzer(min_jobs=2).analyze(jobs_with_missing_usage)
+        first, second = results["cluster_analyses"]
+
+        assert first["job_count"] == 3
+        assert first["memory"]["used"]["count"] == 3
+        assert first["memory"]["used"]["mean"] == pytest.approx(600)
+        assert first["memory"]["requested"]["count"] == 3
+        assert second["memory"]["used"]["count"] == 2
+        assert second["memory"]["used"]["mean"] == pytest.approx(900)
+
+    def test_cluster_without_usage(self, jobs_with_missing_usage):
+        jobs = jobs_with_missing_usage.assign(MemoryUsage=[500, np.nan, 700, np.nan, np.nan])
+        second = MemoryAnalyzer(min_jobs=2).analyze(jobs)["cluster_analyses"][1]
+
+        assert second["memory"]["used"]["count"] == 2
+        assert np.isnan(second["memory"]["used"]["mean"])
+        assert second["memory"]["ratios"]["count"] == 0
+
+    def test_user_totals(self, jobs_with_missing_usage):
+        results = MemoryAnalyzer(min_jobs=2).analyze(jobs_with_missing_usage)
+        totals = results["user_totals"]["user1"]
+
+        assert totals["total_jobs"] == 5
+        assert totals["total_requested_memory"] == pytest.approx(7000)
+        assert totals["total_used_memory"] == pytest.approx(3600)
+        assert totals["memory_ratios"] == [pytest.approx(0.6), pytest.approx(0.45)]
+
+    def test_summary_report_totals(self, jobs_with_missing_usage):
+        report = format_summary_report(MemoryAnalyzer(min_jobs=2).analyze(jobs_with_missing_usage))
+
+        assert "Total Requested Memory: 6.84 GB" in report
+        assert "Total Used Memory: 3.52 GB" in report
+        assert "Overall Memory Usage Ratio: 51.43%" in report
+
+
+class TestCalculateStats:
+    def test_missing_values_counted_but_ignored(self):
+        stats = calculate_stats([1.0, np.nan, 3.0])
+
+        assert stats["count"] == 3
+        assert stats["mean"] == pytest.approx(2.0)
+
+    def test_all_missing(self):
+        stats = calculate_stats([np.nan, np.nan])
+
+        assert stats["count"] == 2
+        assert np.isnan(stats["mean"])
+
+    def test_empty(self):
+        assert calculate_stats([])["count"] == 0
+
+
+class TestResultCache:
+    def test_disabled_by_default(self, jobs_with_missing_usage):
+        analyzer = MemoryAnalyzer(min_jobs=2)
+
+        first = analyzer.analyze(jobs_with_missing_usage)
+        assert analyzer.analyze(jobs_with_missing_usage) is not first
+        assert not analyzer._cache
+
+    def test_reuses_result_for_identical_data(self, jobs_with_missing_usage):
+        analyzer = MemoryAnalyzer(min_jobs=2, cache_size=1)
+
+        first = analyzer.analyze(jobs_with_missing_usage)
+        assert analyzer.analyze(jobs_with_missing_usage.copy()) is first
+
+        changed = jobs_with_missing_usage.assign(RequestMemory=4000)
+        assert analyzer.analyze(changed) is not first
+        assert len(analyzer._cache) == 1
+
+
+class TestMissingOwner:
+    @pytest.mark.parametrize(
+        "owners",
+        [[None, None, "user2"], [np.nan, np.nan, "user2"], pd.array([None, None, "user2"])],
+    )
+    def test_missing_owner_is_none(self, owners):
+        df = pd.DataFrame(
+            {
+                "ClusterId": [1, 1, 2],
+                "Owner": owners,
+                "RequestMemory": [1000, 1000, 2000],
+                "MemoryUsage": [100, 200, 300],
+            }
+        )
+        results = MemoryAnalyzer(min_jobs=1).analyze(df)
+
+        assert [analysis["owner"] for analysis in results["cluster_analyses"]] == [None, "user2"]
+        assert list(results["user_totals"]) == [None, "user2"]
+        assert results["user_totals"][None]["total_jobs"] == 2
+
+
+class TestOverAllocators:
+    @staticmethod
+    def cluster(cluster_id, ratio):
+        return {
+            "cluster_id": cluster_id,
+            "owner": f"user{cluster_id}",
+            "memory": {"ratios": {"mean": ratio}},
+        }
+
+    def test_sorted_by_ratio_with_ties_in_cluster_order(self):
+        analyses = [
+            self.cluster(1, 0.4),
+            self.cluster(2, 0.1),
+            self.cluster(3, np.nan),
+            self.cluster(4, 0.0),
+            self.cluster(5, 0.5),
+            self.cluster(6, 0.1),
+            self.cluster(7, 0.9),
+            self.cluster(8, 0.25),
+        ]
+
+        over_allocators = MemoryAnalyzer()._find_over_allocators(analyses)
+
+        assert over_allocators == [
+            (2, "user2", 0.1),
+            (6, "user6", 0.1),
+            (8, "user8", 0.25),
+            (1, "user1", 0.4),
+        ]
+
+    def test_threshold(self):
+        analyses = [self.cluster(1, 0.4), self.cluster(2, 0.6), self.cluster(3, 0.7)]
+
+        over_allocators = MemoryAnalyzer()._find_over_allocators(analyses, threshold=0.65)
+
+        assert [cluster_id for cluster_id, _, _ in over_allocators] == [1, 2]
+
+    def test_no_clusters(self):
+        assert MemoryAnalyzer()._find_over_allocators([]) == []
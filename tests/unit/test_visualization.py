@@ -0,0 +1,248 @@
+"""Tests for report formatting and histograms"""
+
+import numpy as np
+import pytest
+
+from chtc_memory_analyzer.visualization import (
+    create_histogram,
+    format_bytes,
+    format_cluster_report,
+    format_summary_report,
+)
+
+pytestmark = pytest.mark.unit
+
+
+class TestFormatBytes:
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            (None, "N/A"),
+            (0, "0.00 B"),
+            (1023.999, "1024.00 B"),
+            (1024, "1.00 KB"),
+            (1048575.99, "1024.00 KB"),
+            (1048576, "1.00 MB"),
+            (3 * 1024**5, "3.00 PB"),
+            (5 * 1024**6, "5120.00 PB"),
+        ],
+    )
+    def test_unit_boundaries(self, value, expected):
+        assert format_bytes(value) == expected
+
+    @pytest.mark.parametrize("value, expected", [(-1, "-1.00 B"), (-5e9, "-5000000000.00 B")])
+    def test_negative_values_stay_in_bytes(self, value, expected):
+        assert format_bytes(value) == expected
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [(float("nan"), "nan PB"), (float("inf"), "inf PB"), (float("-inf"), "-inf B")],
+    )
+    def test_non_finite_values(self, value, expected):
+        assert format_bytes(value) == expected
+
+
+class TestCreateHistogram:
+    VALUES = [100, 200, 200, 350, 900, 1000, 1000, 1000, np.nan]
+
+    def test_golden_output(self):
+        assert create_histogram(self.VALUES) == "\n".join(
+            [
+                "    100.00 -   190.00 | " + "█" * 16 + " (1)",
+                "    190.00 -   280.00 | " + "█" * 33 + " (2)",
+                "    280.00 -   370.00 | " + "█" * 16 + " (1)",
+                "    370.00 -   460.00 |  (0)",
+                "    460.00 -   550.00 |  (0)",
+                "    550.00 -   640.00 |  (0)",
+                "    640.00 -   730.00 |  (0)",
+                "    730.00 -   820.00 |  (0)",
+                "    820.00 -   910.00 | " + "█" * 16 + " (1)",
+                "    910.00 -  1000.00 | " + "█" * 50 + " (3)",
+            ]
+        )
+
+    def test_float32_array_matches_list(self):
+        values = np.array(self.VALUES, dtype=np.float32)
+
+        assert create_histogram(values) == create_histogram(self.VALUES)
+
+    def test_bins_and_width(self):
+        assert create_histogram([1, 2, 3, 4], bins=3, width=6) == (
+            "      1.00 -     2.00 | ███ (1)\n"
+            "      2.00 -     3.00 | ███ (1)\n"
+            "      3.00 -     4.00 | ██████ (2)"
+        )
+
+    def test_bars_wider_than_prebuilt_pool(self):
+        lines = create_histogram([1, 2], bins=2, width=1500).split("\n")
+
+        assert [line.count("█") for line in lines] == [1500, 1500]
+
+    @pytest.mark.parametrize(
+        "values, expected",
+        [
+            ([], "No data"),
+            ([np.nan, np.nan], "No valid data (all NaN)"),
+            ([5, 5, 5], "All values equal: 5.00"),
+        ],
+    )
+    def test_degenerate_input(self, values, expected):
+        assert create_histogram(values) == expected
+
+
+def _stats(mean, median, stdev, minimum, maximum, count):
+    return {
+        "mean": mean,
+        "median": median,
+        "stdev": stdev,
+        "min": minimum,
+        "max": maximum,
+        "count": count,
+    }
+
+
+@pytest.fixture
+def report_results():
+    """Hand-built analyze() results for two clusters, without all_used_memory"""
+    first = {
+        "cluster_id": 1,
+        "job_count": 3,
+        "owner": "user1",
+        "memory": {
+            "requested": _stats(1000, 1000, 0, 1000, 1000, 3),
+            "used": _stats(400.0, 300.0, 173.21, 300.0, 600.0, 3),
+            "ratios": _stats(0.4, 0.3, 0.17, 0.3, 0.6, 3),
+        },
+        "raw_data": {"used_memory": [300.0, 300.0, 600.0]},
+    }
+    second = {
+        "cluster_id": 2,
+        "job_count": 2,
+        "owner": "user2",
+        "memory": {
+            "requested": _stats(2048.0, 2048.0, 0.0, 2048.0, 2048.0, 2),
+            "used": _stats(1800.0, 1800.0, 282.84, 1600.0, 2000.0, 2),
+            "ratios": _stats(0.0, 0.0, 0.0, 0.0, 0.0, 0),
+        },
+        "raw_data": {"used_memory": [1600.0, 2000.0]},
+    }
+    return {
+        "cluster_analyses": [first, second],
+        "user_totals": {
+            "user2": {
+                "clusters": [2],
+                "total_jobs": 2,
+                "total_requested_memory": 4096.0,
+                "total_used_memory": 3600.0,
+                "memory_ratios": [],
+            },
+            "user1": {
+                "clusters": [1],
+                "total_jobs": 3,
+                "total_requested_memory": 3000.0,
+                "total_used_memory": 1200.0,
+                "memory_ratios": [0.4],
+            },
+        },
+        "over_allocators": [(1, "user1", 0.4)],
+    }
+
+
+CLUSTER_REPORT = """
+================================================================================
+Cluster: 1 | Owner: user1 | Jobs: 3
+================================================================================
+
+MEMORY REQUEST: {'mean': 1000, 'median': 1000, 'stdev': 0, 'min': 1000, 'max': 1000, 'count': 3}
+
+MEMORY USAGE:
+--------------------------------------------------------------------------------
+  Used Memory (MB):
+    Mean: 400.00 | Median: 300.00 | Std Dev: 173.21
+    Min: 300.00 | Max: 600.00
+
+  Usage Ratio (Used/Requested):
+    Mean: 40.00% | Median: 30.00%
+
+  Memory Usage Histogram (MB):
+    300.00 -   330.00 | ██████████████████████████████████████████████████ (2)
+    330.00 -   360.00 |  (0)
+    360.00 -   390.00 |  (0)
+    390.00 -   420.00 |  (0)
+    420.00 -   450.00 |  (0)
+    450.00 -   480.00 |  (0)
+    480.00 -   510.00 |  (0)
+    510.00 -   540.00 |  (0)
+    540.00 -   570.00 |  (0)
+    570.00 -   600.00 | █████████████████████████ (1)"""
+
+SUMMARY_REPORT = """
+
+================================================================================
+SUMMARY
+================================================================================
+Total clusters analyzed: 2
+
+================================================================================
+MEMORY USAGE HISTOGRAM - ALL CLUSTERS
+================================================================================
+Total jobs with memory data: 5
+Mean: 960.00 MB | Median: 600.00 MB | Std Dev: 789.30 MB
+Min: 300.00 MB | Max: 2000.00 MB
+
+Histogram:
+    300.00 -   470.00 | ██████████████████████████████████████████████████ (2)
+    470.00 -   640.00 | █████████████████████████ (1)
+    640.00 -   810.00 |  (0)
+    810.00 -   980.00 |  (0)
+    980.00 -  1150.00 |  (0)
+   1150.00 -  1320.00 |  (0)
+   1320.00 -  1490.00 |  (0)
+   1490.00 -  1660.00 | █████████████████████████ (1)
+   1660.00 -  1830.00 |  (0)
+   1830.00 -  2000.00 | █████████████████████████ (1)
+
+================================================================================
+PER-USER TOTALS ACROSS ALL CLUSTERS
+================================================================================
+
+User: user1
+  Clusters: 1 (IDs: 1)
+  Total Jobs: 3
+  Total Requested Memory: 2.93 GB
+  Total Used Memory: 1.17 GB
+  Average Memory Usage Ratio: 40.00%
+  Overall Memory Usage Ratio: 40.00%
+
+User: user2
+  Clusters: 1 (IDs: 2)
+  Total Jobs: 2
+  Total Requested Memory: 4.00 GB
+  Total Used Memory: 3.52 GB
+
+================================================================================
+Top Memory Over-Allocators (using <50% of requested):
+================================================================================
+  Cluster 1 (user1): 40.0% average usage"""
+
+
+class TestReports:
+    """Report text is compared against output of the original list-and-join formatters"""
+
+    def test_cluster_report(self, report_results):
+        assert format_cluster_report(report_results["cluster_analyses"][0]) == CLUSTER_REPORT
+
+    def test_cluster_report_without_ratios(self, report_results):
+        report = format_cluster_report(report_results["cluster_analyses"][1])
+
+        assert "Usage Ratio" not in report
+        assert "    Min: 1600.00 | Max: 2000.00\n\n  Memory Usage Histogram (MB):" in report
+
+    def test_summary_report(self, report_results):
+        assert format_summary_report(report_results) == SUMMARY_REPORT
+
+    def test_summary_report_top_users(self, report_results):
+        report = format_summary_report(report_results, top_users=1)
+
+        assert "User: user1" in report
+        assert "User: user2" not in report